@@ -1,14 +1,29 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 import asyncpg
+from app.core.body import json_body, json_body_openapi
+from app.core.cache import (
+    cache_delete,
+    cache_get,
+    cache_set,
+    sensor_data_key,
+    unit_statistics_key
+)
+from app.core.config import settings
 from app.core.database import get_db_pool
+from app.core.responses import RecordJSONResponse, dumps, project_record
 from app.crud.sensor_data_repo import SensorDataRepository
 from app.schemas.sensor_data import (
     SensorData,
+    SensorDataBatchResult,
     SensorDataCreate,
     SensorDataUpdate,
-    SensorDataStatistics
+    SensorDataStatistics,
+    validate_create,
+    validate_create_batch,
+    validate_update
 )
 
 router = APIRouter(
@@ -23,6 +38,10 @@ async def get_sensor_repo(
     return SensorDataRepository(pool)
 
 
+def _json_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
 @router.get(
     "/",
     response_model=List[SensorData],
@@ -40,7 +59,9 @@ async def list_sensor_data(
     """
     try:
         data = await repo.get_all(limit=limit, offset=offset, unit_id=unit_id)
-        return [SensorData(**item) for item in data]
+        return RecordJSONResponse(
+            [project_record(SensorData, item) for item in data]
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,14 +69,47 @@ async def list_sensor_data(
         )
 
 
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Stream sensor data as NDJSON",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One SensorData JSON object per line."
+        }
+    }
+)
+async def stream_sensor_data(
+    unit_id: Optional[UUID] = None,
+    limit: Optional[int] = None,
+    repo: SensorDataRepository = Depends(get_sensor_repo)
+):
+    """
+    Streams sensor data records, newest first, as newline-delimited JSON.
+    Rows are read from a server-side cursor, so large exports are sent
+    without loading the whole result set into memory.
+    Optionally filter by unit ID and cap the number of rows.
+    """
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        async for record in repo.stream(unit_id=unit_id, limit=limit):
+            yield dumps(project_record(SensorData, record)) + b"\n"
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.post(
     "/",
     response_model=SensorData,
     status_code=status.HTTP_201_CREATED,
-    summary="Create new sensor data"
+    summary="Create new sensor data",
+    openapi_extra=json_body_openapi(SensorDataCreate.model_json_schema())
 )
 async def create_sensor_data(
-    data: SensorDataCreate,
+    data: SensorDataCreate = Depends(json_body(validate_create)),
     repo: SensorDataRepository = Depends(get_sensor_repo)
 ):
     """
@@ -70,7 +124,10 @@ async def create_sensor_data(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create sensor data due to an internal error."
             )
-        return SensorData(**new_data)
+        return RecordJSONResponse(
+            project_record(SensorData, new_data),
+            status_code=status.HTTP_201_CREATED
+        )
     except (
         asyncpg.exceptions.ForeignKeyViolationError,
         asyncpg.exceptions.InvalidTextRepresentationError
@@ -87,6 +144,40 @@ async def create_sensor_data(
         )
 
 
+@router.post(
+    "/batch",
+    response_model=SensorDataBatchResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create sensor data in bulk",
+    openapi_extra=json_body_openapi({
+        "type": "array",
+        "items": SensorDataCreate.model_json_schema()
+    })
+)
+async def create_sensor_data_batch(
+    items: List[SensorDataCreate] = Depends(json_body(validate_create_batch)),
+    repo: SensorDataRepository = Depends(get_sensor_repo)
+):
+    """
+    Ingests a batch of sensor data records in a single database round-trip.
+    Returns the generated IDs in the same order as the submitted records.
+    All referenced units must exist, otherwise nothing is stored.
+    """
+    try:
+        ids = await repo.create_many(items)
+        return SensorDataBatchResult(count=len(ids), ids=ids)
+    except asyncpg.exceptions.ForeignKeyViolationError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unit does not exist"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get(
     "/{sensor_data_id}",
     response_model=SensorData,
@@ -100,6 +191,10 @@ async def get_sensor_data(
     Retrieves detailed information for a specific sensor data record
     using its UUID.
     """
+    cache_key = sensor_data_key(sensor_data_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return _json_response(cached)
     try:
         data = await repo.get_by_id(sensor_data_id)
         if not data:
@@ -107,7 +202,9 @@ async def get_sensor_data(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sensor data with ID {sensor_data_id} not found."
             )
-        return SensorData(**data)
+        body = dumps(project_record(SensorData, data))
+        await cache_set(cache_key, body, settings.CACHE_TTL_SENSOR_DATA)
+        return _json_response(body)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -117,8 +214,10 @@ async def get_sensor_data(
 
 @router.get(
     "/unit/{unit_id}/statistics",
-    response_model=SensorDataStatistics,
-    summary="Get unit statistics"
+    response_model=None,
+    summary="Get unit statistics",
+    # Documented only; the aggregate row is returned unvalidated
+    responses={200: {"model": SensorDataStatistics}}
 )
 async def get_unit_statistics(
     unit_id: UUID,
@@ -127,6 +226,10 @@ async def get_unit_statistics(
     """
     Retrieves statistical information about sensor data for a specific unit.
     """
+    cache_key = unit_statistics_key(unit_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return _json_response(cached)
     try:
         stats = await repo.get_unit_statistics(unit_id)
         if not stats:
@@ -134,7 +237,10 @@ async def get_unit_statistics(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="no sensor data found"
             )
-        return SensorDataStatistics(**stats)
+        # Not invalidated on writes; the short TTL bounds staleness
+        body = dumps(stats)
+        await cache_set(cache_key, body, settings.CACHE_TTL_STATISTICS)
+        return _json_response(body)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -145,32 +251,26 @@ async def get_unit_statistics(
 @router.put(
     "/{sensor_data_id}",
     response_model=SensorData,
-    summary="Update sensor data"
+    summary="Update sensor data",
+    openapi_extra=json_body_openapi(SensorDataUpdate.model_json_schema())
 )
 async def update_sensor_data(
     sensor_data_id: UUID,
-    data: SensorDataUpdate,
+    data: SensorDataUpdate = Depends(json_body(validate_update)),
     repo: SensorDataRepository = Depends(get_sensor_repo)
 ):
     """
     Updates a sensor data record. Only provided fields will be updated.
     """
     try:
-        # First check if record exists
-        existing_data = await repo.get_by_id(sensor_data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with ID {sensor_data_id} not found."
-            )
-
         updated_data = await repo.update(sensor_data_id, data)
         if not updated_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sensor data with ID {sensor_data_id} not found."
             )
-        return SensorData(**updated_data)
+        await cache_delete(sensor_data_key(sensor_data_id))
+        return RecordJSONResponse(project_record(SensorData, updated_data))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -196,21 +296,13 @@ async def delete_sensor_data(
     Deletes a sensor data record from the system.
     """
     try:
-        # First check if record exists
-        existing_data = await repo.get_by_id(sensor_data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with ID {sensor_data_id} not found."
-            )
-
-        # Then try to delete it
-        deleted = await repo.delete(sensor_data_id)
-        if not deleted:
+        deleted_id = await repo.delete(sensor_data_id)
+        if deleted_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sensor data with ID {sensor_data_id} not found."
             )
+        await cache_delete(sensor_data_key(sensor_data_id))
         return  # Return None for 204 response
     except ValueError as e:
         raise HTTPException(
@@ -233,23 +325,14 @@ async def archive_sensor_data(
     Archived records are still accessible but marked as archived.
     """
     try:
-        # First check if record exists
-        existing_data = await repo.get_by_id(sensor_data_id)
-        if not existing_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sensor data with ID {sensor_data_id} not found."
-            )
-
         archived_data = await repo.archive_data(sensor_data_id)
         if not archived_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sensor data with ID {sensor_data_id} not found."
             )
-
-        # Convert the dict returned by the mock
-        return SensorData.model_validate(archived_data)
+        await cache_delete(sensor_data_key(sensor_data_id))
+        return RecordJSONResponse(project_record(SensorData, archived_data))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
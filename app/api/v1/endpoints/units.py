@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from uuid import UUID
-from app.schemas.unit import UnitCreate, UnitRead, UnitUpdate
+from app.schemas.unit import (
+    UnitCreate,
+    UnitRead,
+    UnitUpdate,
+    validate_create,
+    validate_update
+)
 from app.crud.unit_repo import UnitRepository
+from app.core.body import json_body, json_body_openapi
+from app.core.cache import cache_delete, unit_statistics_key
 from app.core.database import get_db_pool
+from app.core.responses import RecordJSONResponse, project_record
 import asyncpg
 
 router = APIRouter(prefix="/units", tags=["Units (Asset Management)"])
@@ -21,10 +30,11 @@ async def get_unit_repo(
     "/",
     response_model=UnitRead,
     status_code=status.HTTP_201_CREATED,
-    summary="Create a new Unit"
+    summary="Create a new Unit",
+    openapi_extra=json_body_openapi(UnitCreate.model_json_schema())
 )
 async def create_unit(
-    unit: UnitCreate,
+    unit: UnitCreate = Depends(json_body(validate_create)),
     repo: UnitRepository = Depends(get_unit_repo)
 ):
     """Registers a new IoT unit in the system. The unit name must be unique."""
@@ -35,7 +45,10 @@ async def create_unit(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create unit due to an internal error."
             )
-        return UnitRead(**new_unit)
+        return RecordJSONResponse(
+            project_record(UnitRead, new_unit),
+            status_code=status.HTTP_201_CREATED
+        )
     except ValueError as e:  # Catches UniqueViolationError re-raised by repo
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail=str(e))
@@ -48,7 +61,9 @@ async def read_units(
 ):
     """Retrieves a list of all registered units, supporting pagination."""
     units_data = await repo.get_all(limit=limit, offset=offset)
-    return [UnitRead(**data) for data in units_data]
+    return RecordJSONResponse(
+        [project_record(UnitRead, data) for data in units_data]
+    )
 
 
 @router.get(
@@ -67,17 +82,18 @@ async def read_unit(
     if not unit_data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Unit with ID {unit_id} not found.")
-    return UnitRead(**unit_data)
+    return RecordJSONResponse(project_record(UnitRead, unit_data))
 
 
 @router.put(
     "/{unit_id}",
     response_model=UnitRead,
-    summary="Update Unit details"
+    summary="Update Unit details",
+    openapi_extra=json_body_openapi(UnitUpdate.model_json_schema())
 )
 async def update_unit(
     unit_id: UUID,
-    unit: UnitUpdate,
+    unit: UnitUpdate = Depends(json_body(validate_update)),
     repo: UnitRepository = Depends(get_unit_repo)
 ):
     """
@@ -89,7 +105,7 @@ async def update_unit(
         if not updated_unit:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail=f"Unit with ID {unit_id} not found.")
-        return UnitRead(**updated_unit)
+        return RecordJSONResponse(project_record(UnitRead, updated_unit))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail=str(e))
@@ -112,4 +128,7 @@ async def delete_unit(
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Unit with ID {unit_id} not found.")
+    await cache_delete(unit_statistics_key(unit_id))
+    # Cached sensor data records of the unit are not looked up here; they
+    # expire within CACHE_TTL_SENSOR_DATA seconds
     return
@@ -0,0 +1,71 @@
+import re
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+import msgspec
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+T = TypeVar("T")
+
+# msgspec reports the failing location as a JSON path suffix, e.g.
+# "Expected `float`, got `str` - at `$[0].temperature`"
+_MSGSPEC_ERROR = re.compile(r"^(?P<msg>.*?)(?: - at `\$(?P<path>[^`]*)`)?$")
+_MSGSPEC_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_MSGSPEC_MISSING = re.compile(r"^Object missing required field `([^`]+)`$")
+_MSGSPEC_UNKNOWN = re.compile(r"^Object contains unknown field `([^`]+)`$")
+
+
+def _msgspec_error(e: msgspec.DecodeError) -> Dict[str, Any]:
+    """Translates a msgspec error into pydantic's error shape."""
+    match = _MSGSPEC_ERROR.match(str(e))
+    msg = match["msg"]
+    loc = ["body"]
+    for key, index in _MSGSPEC_PATH_PART.findall(match["path"] or ""):
+        loc.append(key or int(index))
+    missing = _MSGSPEC_MISSING.match(msg)
+    unknown = _MSGSPEC_UNKNOWN.match(msg)
+    if missing:
+        loc.append(missing[1])
+        error_type = "missing"
+    elif unknown:
+        loc.append(unknown[1])
+        error_type = "extra_forbidden"
+    elif isinstance(e, msgspec.ValidationError):
+        error_type = "value_error"
+    else:
+        error_type = "json_invalid"
+    return {"type": error_type, "loc": tuple(loc), "msg": msg}
+
+
+def json_body(
+        validate: Callable[[bytes], T]
+) -> Callable[[Request], Awaitable[T]]:
+    """Dependency that validates the raw request body in a single step.
+
+    ``validate`` is one of the schema modules' ``validate_*`` helpers, so
+    parsing and validation both happen in pydantic-core (or msgspec).
+    Failures are reported like FastAPI's own body validation errors.
+    """
+    async def dependency(request: Request) -> T:
+        try:
+            return validate(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+        except msgspec.DecodeError as e:
+            # msgspec stops at the first error, so there is only ever one
+            raise RequestValidationError([_msgspec_error(e)])
+
+    return dependency
+
+
+def json_body_openapi(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """``openapi_extra`` documenting a body read through ``json_body``."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}}
+        }
+    }
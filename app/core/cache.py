@@ -0,0 +1,70 @@
+import logging
+import redis.asyncio as redis
+from uuid import UUID
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global Redis client; stays None when no REDIS_URL is configured
+client: redis.Redis | None = None
+
+
+async def connect_cache():
+    """Creates the Redis client if caching is enabled."""
+    global client
+    if settings.REDIS_URL:
+        # Without timeouts a hung Redis would block every cached request
+        client = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.CACHE_CONNECT_TIMEOUT,
+            socket_timeout=settings.CACHE_SOCKET_TIMEOUT
+        )
+        print("--- Redis cache client created ---")
+
+
+async def disconnect_cache():
+    """Closes the Redis client."""
+    global client
+    if client:
+        await client.aclose()
+        client = None
+        print("--- Redis cache client closed ---")
+
+
+def sensor_data_key(sensor_data_id: UUID) -> str:
+    return f"sd:{sensor_data_id}"
+
+
+def unit_statistics_key(unit_id: UUID) -> str:
+    return f"sd:stats:{unit_id}"
+
+
+# The cache is best-effort: when Redis is unavailable or times out requests
+# fall through to the database instead of failing.
+
+async def cache_get(key: str) -> bytes | None:
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl: int):
+    if client is None:
+        return
+    try:
+        await client.setex(key, ttl, value)
+    except redis.RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def cache_delete(key: str):
+    if client is None:
+        return
+    try:
+        await client.delete(key)
+    except redis.RedisError as e:
+        logger.warning("Cache invalidation failed for %s: %s", key, e)
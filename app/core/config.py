@@ -9,6 +9,30 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
 
+    # Connection Pool Configuration. Pools are per worker process, so
+    # WEB_CONCURRENCY * DB_POOL_MAX must stay below Postgres'
+    # max_connections (100 by default): 4 workers * 20 leaves headroom
+    # for maintenance sessions.
+    DB_POOL_MIN: int = 10
+    DB_POOL_MAX: int = 20
+    # Seconds before an idle connection above DB_POOL_MIN is closed
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0
+    # Set when DB_HOST/DB_PORT point at PgBouncer in transaction mode
+    DB_PGBOUNCER: bool = False
+
+    # Months of sensor_data partitions kept created ahead, including the
+    # current one; checked at startup and then daily
+    SENSOR_DATA_PARTITION_MONTHS: int = 12
+
+    # Cache Configuration (caching is disabled when REDIS_URL is unset)
+    REDIS_URL: str | None = None
+    CACHE_TTL_SENSOR_DATA: int = 60
+    CACHE_TTL_STATISTICS: int = 15
+    # Seconds a Redis connect or command may take before the request
+    # falls through to the database
+    CACHE_CONNECT_TIMEOUT: float = 0.25
+    CACHE_SOCKET_TIMEOUT: float = 0.25
+
     # General Configuration
     PROJECT_NAME: str = "FastAPI IoT API"
     API_V1_STR: str = "/v1"
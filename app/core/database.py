@@ -1,15 +1,138 @@
-from contextlib import asynccontextmanager
 import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+from fastapi import Depends
 from app.core.config import settings
-from typing import AsyncGenerator
+from app.crud.sensor_data_repo import PREPARED_QUERIES as SENSOR_DATA_QUERIES
+from app.crud.unit_repo import PREPARED_QUERIES as UNIT_QUERIES
+from typing import AsyncGenerator, Dict
 
 # Global variable to hold the connection pool
 pool: asyncpg.Pool | None = None
 
 
+class PreparedConnection(asyncpg.Connection):
+    """Connection that keeps one server-side prepared statement per query.
+
+    ``Connection.prepare`` always creates a new statement, so repositories
+    go through ``prepared()`` to reuse the handle (and the server-side plan)
+    for as long as the pooled connection lives.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prepared: Dict[str, PreparedStatement] = {}
+
+    async def prepared(self, query: str) -> "_CachedStatement":
+        stmt = self._prepared.get(query)
+        if stmt is None:
+            stmt = await self.prepare(query)
+            self._prepared[query] = stmt
+        return _CachedStatement(self, query, stmt)
+
+
+class _CachedStatement:
+    """A kept ``PreparedStatement`` that is re-prepared once it goes stale.
+
+    Schema changes (e.g. ``ALTER TABLE``) invalidate server-side plans, and
+    asyncpg then raises ``InvalidCachedStatementError``. The handle is
+    dropped and, outside a transaction, the call is retried once with a
+    freshly prepared statement. Inside a transaction the error is raised,
+    since the transaction is already aborted.
+    """
+
+    def __init__(
+            self,
+            conn: PreparedConnection,
+            query: str,
+            stmt: PreparedStatement
+    ):
+        self._conn = conn
+        self._query = query
+        self._stmt = stmt
+
+    async def _run(self, method: str, *args):
+        try:
+            return await getattr(self._stmt, method)(*args)
+        except asyncpg.exceptions.InvalidCachedStatementError:
+            if self._conn._prepared.get(self._query) is self._stmt:
+                del self._conn._prepared[self._query]
+            if self._conn.is_in_transaction():
+                raise
+        self._stmt = (await self._conn.prepared(self._query))._stmt
+        return await getattr(self._stmt, method)(*args)
+
+    async def fetch(self, *args):
+        return await self._run("fetch", *args)
+
+    async def fetchrow(self, *args):
+        return await self._run("fetchrow", *args)
+
+    async def fetchval(self, *args):
+        return await self._run("fetchval", *args)
+
+    async def executemany(self, args):
+        return await self._run("executemany", args)
+
+
+class _UnnamedStatement:
+    """Stand-in for ``PreparedStatement`` that runs each call unnamed."""
+
+    def __init__(self, conn: asyncpg.Connection, query: str):
+        self._conn = conn
+        self._query = query
+
+    async def fetch(self, *args):
+        return await self._conn.fetch(self._query, *args)
+
+    async def fetchrow(self, *args):
+        return await self._conn.fetchrow(self._query, *args)
+
+    async def fetchval(self, *args):
+        return await self._conn.fetchval(self._query, *args)
+
+    async def executemany(self, args):
+        return await self._conn.executemany(self._query, args)
+
+
+class PgBouncerConnection(PreparedConnection):
+    """Connection for PgBouncer transaction pooling.
+
+    Consecutive transactions may land on different server connections, so
+    named prepared statements cannot be kept; queries are sent unnamed.
+    """
+
+    async def prepared(self, query: str) -> _UnnamedStatement:
+        return _UnnamedStatement(self, query)
+
+
+async def _init_connection(conn: PreparedConnection):
+    """Prepares the hot repository queries once per new pool connection."""
+    for query in (*SENSOR_DATA_QUERIES, *UNIT_QUERIES):
+        await conn.prepared(query)
+
+
 async def connect_db():
     """Initializes the PostgreSQL connection pool."""
     global pool
+    server_settings = {"application_name": "iot-api"}
+    if settings.DB_PGBOUNCER:
+        # PgBouncer refuses startup parameters it does not track, so jit
+        # has to be disabled on the database side in this setup
+        statement_options = {
+            "statement_cache_size": 0,
+            "connection_class": PgBouncerConnection,
+        }
+    else:
+        # JIT compilation only pays off for long analytical queries; for
+        # these short lookups it adds planning latency
+        server_settings["jit"] = "off"
+        statement_options = {
+            "statement_cache_size": 1024,
+            # Keep cached statements for the life of the connection
+            "max_cached_statement_lifetime": 0,
+            "connection_class": PreparedConnection,
+            "init": _init_connection,
+        }
     try:
         pool = await asyncpg.create_pool(
             user=settings.DB_USER,
@@ -17,8 +140,13 @@ async def connect_db():
             database=settings.DB_NAME,
             host=settings.DB_HOST,
             port=settings.DB_PORT,
-            min_size=5,
-            max_size=20
+            min_size=settings.DB_POOL_MIN,
+            max_size=settings.DB_POOL_MAX,
+            max_inactive_connection_lifetime=(
+                settings.DB_POOL_MAX_INACTIVE_LIFETIME
+            ),
+            server_settings=server_settings,
+            **statement_options
         )
         print("--- Database connection pool created successfully ---")
     except Exception as e:
@@ -35,17 +163,28 @@ async def disconnect_db():
         print("--- Database connection pool closed ---")
 
 
-async def get_db_pool() -> AsyncGenerator[asyncpg.Pool, None]:
-    """Dependency injector for database connection pool."""
-    if not pool:
-        # Should be handled by application startup, but good for safety
-        await connect_db()
-    yield pool
+async def get_db_pool() -> asyncpg.Pool:
+    """Dependency injector for database connection pool.
+
+    The pool is a process-wide singleton with nothing to clean up per
+    request, so it is returned directly rather than yielded. It is created
+    once by the application lifespan; creating it lazily here would let
+    concurrent first requests race and open duplicate pools.
+    """
+    if pool is None:
+        raise RuntimeError("Database pool not initialized")
+    return pool
+
 
+async def get_connection(
+    db_pool: asyncpg.Pool = Depends(get_db_pool)
+) -> AsyncGenerator[asyncpg.Connection, None]:
+    """Dependency injector for a request-scoped database connection.
 
-@asynccontextmanager
-async def get_connection():
-    """Dependency injector for database connection.
+    FastAPI caches dependencies per request, so every ``get_connection``
+    dependency of one request shares a single connection, acquired on first
+    use and released when the request finishes. Requests that never touch
+    the database never take a connection from the pool.
 
     Usage:
         @app.get("/endpoint")
@@ -54,7 +193,5 @@ async def get_connection():
             result = await conn.fetch("SELECT * FROM table")
             return result
     """
-    if not pool:
-        await connect_db()
-    async with pool.acquire() as connection:
+    async with db_pool.acquire() as connection:
         yield connection
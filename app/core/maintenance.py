@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from app.core import database
+from app.core.config import settings
+from app.crud.sensor_data_repo import SensorDataRepository
+
+logger = logging.getLogger(__name__)
+
+PARTITION_CHECK_INTERVAL = 24 * 60 * 60  # seconds
+
+# Background task creating sensor_data partitions; None when not running
+task: asyncio.Task | None = None
+
+
+async def _maintain_partitions():
+    """Keeps future monthly partitions created for as long as we run.
+
+    Rows for a month without a partition land in the default partition,
+    after which that month's partition can no longer be created.
+    """
+    while True:
+        try:
+            await SensorDataRepository(database.pool).ensure_partitions(
+                settings.SENSOR_DATA_PARTITION_MONTHS
+            )
+        except Exception as e:  # keep the loop alive; retried next round
+            logger.warning("Partition maintenance failed: %s", e)
+        await asyncio.sleep(PARTITION_CHECK_INTERVAL)
+
+
+async def start_maintenance():
+    """Starts the background maintenance task."""
+    global task
+    task = asyncio.create_task(_maintain_partitions())
+    print("--- Partition maintenance started ---")
+
+
+async def stop_maintenance():
+    """Stops the background maintenance task."""
+    global task
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        task = None
+        print("--- Partition maintenance stopped ---")
@@ -0,0 +1,51 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple, Type
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Encodes the values orjson has no native support for."""
+    # NUMERIC columns are returned by asyncpg as Decimal
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def project_record(
+        model: Type[BaseModel],
+        record: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Picks ``model``'s fields out of a trusted database row.
+
+    Rows come straight from Postgres, so they are not revalidated; the
+    projection only keeps the documented response shape.
+    """
+    return {field: record[field] for field in _model_fields(model)}
+
+
+def dumps(content: Any) -> bytes:
+    """Serializes database rows (or anything orjson accepts) to JSON."""
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS
+    )
+
+
+class RecordJSONResponse(ORJSONResponse):
+    """ORJSONResponse that can serialize database rows without a model.
+
+    Returning it directly skips FastAPI's ``response_model`` pass, which
+    then only documents the route in OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,43 +1,173 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 from uuid import UUID, uuid4
 import asyncpg
+from app.crud.sql import build_update_query
 from app.schemas.sensor_data import (
     SensorDataCreate,
     SensorDataUpdate
 )
 
+SQL_INSERT_SENSOR = """
+    INSERT INTO sensor_data
+        (unit_id, temperature, humidity, status, is_archived)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING *
+"""
+SQL_INSERT_SENSOR_BATCH = """
+    INSERT INTO sensor_data
+        (id, unit_id, temperature, humidity, status, is_archived)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+COPY_COLUMNS = (
+    "id", "unit_id", "temperature", "humidity", "status", "is_archived"
+)
+# Below this size the extra COPY protocol round-trips cost more than
+# pipelining the INSERTs with executemany
+COPY_MIN_BATCH_SIZE = 100
+SQL_GET_BY_ID = "SELECT * FROM sensor_data WHERE id = $1;"
+SQL_LIST = """
+    SELECT * FROM sensor_data
+    ORDER BY timestamp DESC
+    LIMIT $1 OFFSET $2;
+"""
+SQL_LIST_BY_UNIT = """
+    SELECT * FROM sensor_data
+    WHERE unit_id = $3
+    ORDER BY timestamp DESC
+    LIMIT $1 OFFSET $2;
+"""
+# LIMIT NULL streams every matching row
+SQL_STREAM = """
+    SELECT * FROM sensor_data
+    ORDER BY timestamp DESC
+    LIMIT $1;
+"""
+SQL_STREAM_BY_UNIT = """
+    SELECT * FROM sensor_data
+    WHERE unit_id = $2
+    ORDER BY timestamp DESC
+    LIMIT $1;
+"""
+SQL_DELETE = "DELETE FROM sensor_data WHERE id = $1 RETURNING id;"
+SQL_ARCHIVE = """
+    UPDATE sensor_data
+    SET is_archived = true
+    WHERE id = $1
+    RETURNING *;
+"""
+# unit_stats is kept up to date by a trigger on sensor_data
+SQL_UNIT_STATISTICS = """
+    SELECT
+        unit_id,
+        temperature_sum / NULLIF(temperature_count, 0) as avg_temperature,
+        humidity_sum / NULLIF(humidity_count, 0) as avg_humidity,
+        total_readings,
+        validated_readings,
+        archived_readings
+    FROM unit_stats
+    WHERE unit_id = $1 AND total_readings > 0;
+"""
+
+# Monthly partitions are created ahead of time by app.core.maintenance.
+# The advisory lock serializes the CREATE TABLEs when several workers run
+# this at once.
+SQL_PARTITION_LOCK = (
+    "SELECT pg_advisory_xact_lock(hashtext('sensor_data_partitions'));"
+)
+SQL_ENSURE_PARTITIONS = """
+    SELECT create_sensor_data_partition(
+        (CURRENT_DATE + make_interval(months => m))::date
+    )
+    FROM generate_series(0, $1::int - 1) AS m;
+"""
+
+# Prepared on every new pool connection (see app.core.database)
+PREPARED_QUERIES = (
+    SQL_INSERT_SENSOR,
+    SQL_INSERT_SENSOR_BATCH,
+    SQL_GET_BY_ID,
+    SQL_LIST,
+    SQL_LIST_BY_UNIT,
+    SQL_DELETE,
+    SQL_ARCHIVE,
+    SQL_UNIT_STATISTICS,
+)
+
 
 class SensorDataRepository:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
+    # Inserts referencing a missing unit propagate asyncpg's
+    # ForeignKeyViolationError, which the endpoints map to a 404
     async def create(self, data: SensorDataCreate) -> Dict[str, Any] | None:
-        query = """
-            INSERT INTO sensor_data
-                (id, unit_id, temperature, humidity, status, is_archived)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING *
+        async with self.pool.acquire() as conn:
+            stmt = await conn.prepared(SQL_INSERT_SENSOR)
+            record = await stmt.fetchrow(
+                data.unit_id,
+                data.temperature,
+                data.humidity,
+                data.status,
+                data.is_archived
+            )
+            return dict(record) if record else None
+
+    async def create_many(self, items: List[SensorDataCreate]) -> List[UUID]:
+        """Bulk insert through the binary COPY protocol.
+
+        COPY cannot return rows, so ids are generated here and handed back
+        to the caller in input order. Small batches are pipelined through
+        ``create_many_executemany`` instead.
         """
-        record_id = uuid4()
-        try:
-            async with self.pool.acquire() as conn:
-                record = await conn.fetchrow(
-                    query,
-                    record_id,
-                    data.unit_id,
-                    data.temperature,
-                    data.humidity,
-                    data.status,
-                    data.is_archived
-                )
-                return dict(record) if record else None
-        except asyncpg.exceptions.ForeignKeyViolationError:
-            raise ValueError(f"Unit with id '{data.unit_id}' does not exist.")
+        if not items:
+            return []
+        if len(items) < COPY_MIN_BATCH_SIZE:
+            return await self.create_many_executemany(items)
+        ids, records = self._batch_records(items)
+        async with self.pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                "sensor_data",
+                records=records,
+                columns=COPY_COLUMNS
+            )
+        return ids
+
+    async def create_many_executemany(
+            self,
+            items: List[SensorDataCreate]
+    ) -> List[UUID]:
+        """Bulk insert by pipelining one INSERT per item in a transaction."""
+        if not items:
+            return []
+        ids, records = self._batch_records(items)
+        async with self.pool.acquire() as conn:
+            stmt = await conn.prepared(SQL_INSERT_SENSOR_BATCH)
+            async with conn.transaction():
+                await stmt.executemany(records)
+        return ids
+
+    @staticmethod
+    def _batch_records(
+            items: List[SensorDataCreate]
+    ) -> Tuple[List[UUID], List[tuple]]:
+        ids = [uuid4() for _ in items]
+        records = [
+            (
+                record_id,
+                item.unit_id,
+                item.temperature,
+                item.humidity,
+                item.status,
+                item.is_archived
+            )
+            for record_id, item in zip(ids, items)
+        ]
+        return ids, records
 
     async def get_by_id(self, sensor_data_id: UUID) -> Dict[str, Any] | None:
-        query = "SELECT * FROM sensor_data WHERE id = $1;"
         async with self.pool.acquire() as conn:
-            record = await conn.fetchrow(query, sensor_data_id)
+            stmt = await conn.prepared(SQL_GET_BY_ID)
+            record = await stmt.fetchrow(sensor_data_id)
             return dict(record) if record else None
 
     async def get_all(
@@ -45,67 +175,62 @@ class SensorDataRepository:
             limit: int = 100,
             offset: int = 0,
             unit_id: UUID | None = None
-    ) -> List[Dict[str, Any]]:
-        base_query = "SELECT * FROM sensor_data"
-        where_clause = " WHERE unit_id = $3" if unit_id else ""
-        order_clause = " ORDER BY timestamp DESC"
-        limit_clause = " LIMIT $1 OFFSET $2"
-
-        query = base_query + where_clause + order_clause + limit_clause
-
+    ) -> List[asyncpg.Record]:
+        # Records are mapping-like; callers read the columns they need
+        # instead of paying for a dict copy of every row
+        if unit_id:
+            query, args = SQL_LIST_BY_UNIT, (limit, offset, unit_id)
+        else:
+            query, args = SQL_LIST, (limit, offset)
         async with self.pool.acquire() as conn:
-            if unit_id:
-                records = await conn.fetch(query, limit, offset, unit_id)
-            else:
-                records = await conn.fetch(
-                    base_query + order_clause + limit_clause,
-                    limit,
-                    offset
-                )
-            return [dict(r) for r in records]
+            stmt = await conn.prepared(query)
+            return await stmt.fetch(*args)
 
     async def get_by_unit(
             self,
             unit_id: UUID,
             limit: int = 100,
             offset: int = 0
-    ) -> List[Dict[str, Any]]:
-        query = """
-            SELECT * FROM sensor_data
-            WHERE unit_id = $1
-            ORDER BY timestamp DESC
-            LIMIT $2 OFFSET $3;
+    ) -> List[asyncpg.Record]:
+        async with self.pool.acquire() as conn:
+            stmt = await conn.prepared(SQL_LIST_BY_UNIT)
+            return await stmt.fetch(limit, offset, unit_id)
+
+    async def stream(
+            self,
+            unit_id: UUID | None = None,
+            limit: int | None = None,
+            prefetch: int = 500
+    ) -> AsyncIterator[asyncpg.Record]:
+        """Yields rows from a server-side cursor, newest first.
+
+        Only ``prefetch`` rows are held in memory at a time. The connection
+        stays checked out until the iteration finishes.
         """
+        if unit_id:
+            query, args = SQL_STREAM_BY_UNIT, (limit, unit_id)
+        else:
+            query, args = SQL_STREAM, (limit,)
         async with self.pool.acquire() as conn:
-            records = await conn.fetch(query, unit_id, limit, offset)
-            return [dict(r) for r in records]
+            # Cursors only live inside a transaction
+            async with conn.transaction():
+                async for record in conn.cursor(
+                    query, *args, prefetch=prefetch
+                ):
+                    yield record
 
     async def update(
             self,
             sensor_data_id: UUID,
             data: SensorDataUpdate
     ) -> Dict[str, Any] | None:
-        updates = []
-        values = []
-        i = 1
-
         data_dict = data.model_dump(exclude_none=True)
 
-        for field, value in data_dict.items():
-            updates.append(f"{field} = ${i}")
-            values.append(value)
-            i += 1
-
-        if not updates:
+        if not data_dict:
             return await self.get_by_id(sensor_data_id)
 
-        query = f"""
-            UPDATE sensor_data
-            SET {', '.join(updates)}
-            WHERE id = ${i}
-            RETURNING *;
-        """
-        values.append(sensor_data_id)
+        query = build_update_query("sensor_data", tuple(data_dict))
+        values = [*data_dict.values(), sensor_data_id]
 
         try:
             async with self.pool.acquire() as conn:
@@ -114,46 +239,39 @@ class SensorDataRepository:
         except asyncpg.exceptions.ForeignKeyViolationError:
             raise ValueError("Referenced unit does not exist.")
 
-    async def delete(self, sensor_data_id: UUID) -> bool:
-        query = "DELETE FROM sensor_data WHERE id = $1;"
+    async def delete(self, sensor_data_id: UUID) -> UUID | None:
         async with self.pool.acquire() as conn:
-            status = await conn.execute(query, sensor_data_id)
-            return status == 'DELETE 1'
+            stmt = await conn.prepared(SQL_DELETE)
+            # None when no row matched, so callers can map it to a 404
+            return await stmt.fetchval(sensor_data_id)
 
     async def get_unit_statistics(
             self,
             unit_id: UUID
     ) -> Dict[str, Any] | None:
-        query = """
-            SELECT
-                unit_id,
-                AVG(temperature) as avg_temperature,
-                AVG(humidity) as avg_humidity,
-                COUNT(*) as total_readings,
-                COUNT(*) FILTER (
-                    WHERE status = 'VALIDATED'
-                ) as validated_readings,
-                COUNT(*) FILTER (WHERE is_archived = true) as archived_readings
-            FROM sensor_data
-            WHERE unit_id = $1
-            GROUP BY unit_id;
-        """
+        # One row of precomputed aggregates, however much data the unit has
         async with self.pool.acquire() as conn:
-            record = await conn.fetchrow(query, unit_id)
+            stmt = await conn.prepared(SQL_UNIT_STATISTICS)
+            record = await stmt.fetchrow(unit_id)
             if not record:
                 return None
             return dict(record)
 
+    async def ensure_partitions(self, months_ahead: int) -> None:
+        """Creates the partitions of this month and the following ones.
+
+        Existing partitions are left alone, so this is safe to repeat.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(SQL_PARTITION_LOCK)
+                await conn.execute(SQL_ENSURE_PARTITIONS, months_ahead)
+
     async def archive_data(
             self,
             sensor_data_id: UUID
     ) -> Dict[str, Any] | None:
-        query = """
-            UPDATE sensor_data
-            SET is_archived = true
-            WHERE id = $1
-            RETURNING *;
-        """
         async with self.pool.acquire() as conn:
-            record = await conn.fetchrow(query, sensor_data_id)
+            stmt = await conn.prepared(SQL_ARCHIVE)
+            record = await stmt.fetchrow(sensor_data_id)
             return dict(record) if record else None
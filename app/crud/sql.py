@@ -0,0 +1,19 @@
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=64)
+def build_update_query(table: str, fields: Tuple[str, ...]) -> str:
+    """Builds ``UPDATE <table> SET ... WHERE id = $N RETURNING *``.
+
+    Columns are bound as $1..$n in the given order and the id as $n+1.
+    Callers pass field names from a model dump, so the order is stable and
+    every column subset maps to a single cached query text.
+    """
+    assignments = ", ".join(
+        f"{field} = ${i}" for i, field in enumerate(fields, start=1)
+    )
+    return (
+        f"UPDATE {table} SET {assignments} "
+        f"WHERE id = ${len(fields) + 1} RETURNING *;"
+    )
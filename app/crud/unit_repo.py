@@ -1,24 +1,38 @@
 import asyncpg
 from typing import List, Dict, Any
-from uuid import UUID, uuid4
+from uuid import UUID
+from app.crud.sql import build_update_query
 from app.schemas.unit import UnitCreate, UnitUpdate
 
+SQL_INSERT_UNIT = """
+    INSERT INTO units (name, location, is_active)
+    VALUES ($1, $2, TRUE)
+    RETURNING id, name, location, is_active, created_at;
+"""
+SQL_LIST_UNITS = """
+    SELECT * FROM units ORDER BY created_at DESC LIMIT $1 OFFSET $2;
+"""
+SQL_GET_UNIT_BY_ID = "SELECT * FROM units WHERE id = $1;"
+SQL_DELETE_UNIT = "DELETE FROM units WHERE id = $1 RETURNING id;"
+
+# Prepared on every new pool connection (see app.core.database)
+PREPARED_QUERIES = (
+    SQL_INSERT_UNIT,
+    SQL_LIST_UNITS,
+    SQL_GET_UNIT_BY_ID,
+    SQL_DELETE_UNIT,
+)
+
 
 class UnitRepository:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
     async def create(self, unit: UnitCreate) -> Dict[str, Any] | None:
-        unit_id = uuid4()
-        query = """
-        INSERT INTO units (id, name, location, is_active)
-        VALUES ($1, $2, $3, TRUE)
-        RETURNING id, name, location, is_active, created_at;
-        """
         try:
             async with self.pool.acquire() as conn:
-                record = await conn.fetchrow(query, unit_id,
-                                             unit.name, unit.location)
+                stmt = await conn.prepared(SQL_INSERT_UNIT)
+                record = await stmt.fetchrow(unit.name, unit.location)
                 return dict(record) if record else None
         except asyncpg.exceptions.UniqueViolationError:
             # Re-raise a custom exception if using ORM,
@@ -30,17 +44,15 @@ class UnitRepository:
             limit: int = 100,
             offset: int = 0
     ) -> List[Dict[str, Any]]:
-        query = """
-            SELECT * FROM units ORDER BY created_at DESC LIMIT $1 OFFSET $2;
-        """
         async with self.pool.acquire() as conn:
-            records = await conn.fetch(query, limit, offset)
+            stmt = await conn.prepared(SQL_LIST_UNITS)
+            records = await stmt.fetch(limit, offset)
             return [dict(r) for r in records]
 
     async def get_by_id(self, unit_id: UUID) -> Dict[str, Any] | None:
-        query = "SELECT * FROM units WHERE id = $1;"
         async with self.pool.acquire() as conn:
-            record = await conn.fetchrow(query, unit_id)
+            stmt = await conn.prepared(SQL_GET_UNIT_BY_ID)
+            record = await stmt.fetchrow(unit_id)
             return dict(record) if record else None
 
     async def update(
@@ -48,34 +60,16 @@ class UnitRepository:
             unit_id: UUID,
             unit: UnitUpdate
     ) -> Dict[str, Any] | None:
-        # Build the query dynamically for partial updates
-        updates = []
-        values = []
-        i = 1  # Start index for $ placeholders
-
+        # Only the provided fields are updated; the query text is cached
+        # per field combination
         data = unit.model_dump(exclude_none=True)
 
-        if 'name' in data:
-            updates.append(f"name = ${i}")
-            values.append(data['name'])
-            i += 1
-        if 'location' in data:
-            updates.append(f"location = ${i}")
-            values.append(data['location'])
-            i += 1
-        if 'is_active' in data:
-            updates.append(f"is_active = ${i}")
-            values.append(data['is_active'])
-            i += 1
-
-        if not updates:
+        if not data:
             # No changes, return current state
             return await self.get_by_id(unit_id)
 
-        query = f"""
-            UPDATE units SET {', '.join(updates)} WHERE id = ${i} RETURNING *;
-            """
-        values.append(unit_id)
+        query = build_update_query("units", tuple(data))
+        values = [*data.values(), unit_id]
 
         try:
             async with self.pool.acquire() as conn:
@@ -85,9 +79,7 @@ class UnitRepository:
             raise ValueError("Unit name already exists.")
 
     async def delete(self, unit_id: UUID) -> bool:
-        query = "DELETE FROM units WHERE id = $1;"
         async with self.pool.acquire() as conn:
-            # execute() returns status, command (DELETE 1)
-            status = await conn.execute(query, unit_id)
-            # Check if one row was deleted
-            return status == 'DELETE 1'
+            stmt = await conn.prepared(SQL_DELETE_UNIT)
+            # RETURNING yields None when no row was deleted
+            return await stmt.fetchval(unit_id) is not None
@@ -1,7 +1,11 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
+from app.core.cache import connect_cache, disconnect_cache
 from app.core.database import connect_db, disconnect_db
+from app.core.maintenance import start_maintenance, stop_maintenance
+from app.core.responses import RecordJSONResponse
 # Import endpoints
 from app.api.v1.endpoints import units, sensor_data
 
@@ -10,8 +14,12 @@ from app.api.v1.endpoints import units, sensor_data
 async def lifespan(app: FastAPI):
     # Startup
     await connect_db()
+    await connect_cache()
+    await start_maintenance()
     yield
     # Shutdown
+    await stop_maintenance()
+    await disconnect_cache()
     await disconnect_db()
 
 
@@ -20,14 +28,36 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=RecordJSONResponse,
     lifespan=lifespan
 )
 
+# --- Middleware ---
+# Compresses large list and stream responses; anything under 1 KiB (root,
+# single records, statistics) is sent as is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # --- API Routes ---
 app.include_router(units.router, prefix=settings.API_V1_STR)
 app.include_router(sensor_data.router, prefix=settings.API_V1_STR)
 
 
 @app.get("/", include_in_schema=False)
-def root():
-    return {"message": settings.PROJECT_NAME, "docs": "/docs"}
+async def root():
+    return RecordJSONResponse(
+        {"message": settings.PROJECT_NAME, "docs": "/docs"}
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Same runtime as the container command; workers default to
+    # $WEB_CONCURRENCY when set
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools"
+    )
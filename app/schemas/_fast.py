@@ -0,0 +1,60 @@
+from typing import List, Optional, Union
+from uuid import UUID
+import msgspec
+from msgspec import UNSET, UnsetType
+
+
+class SensorDataCreateFast(msgspec.Struct):
+    """msgspec mirror of ``SensorDataCreate`` for the ingest hot path.
+
+    Keep the fields and defaults in sync with the pydantic schema, which
+    stays the source of truth for the API docs.
+    """
+    unit_id: UUID
+    temperature: Optional[float] = None
+    humidity: Optional[float] = None
+    status: str = "PENDING"
+    is_archived: bool = False
+
+
+class SensorDataUpdateFast(msgspec.Struct, forbid_unknown_fields=True):
+    """msgspec mirror of ``SensorDataUpdate``; unknown fields are errors.
+
+    Fields missing from the body stay ``UNSET`` so that only the ones sent
+    count as set, as with pydantic.
+    """
+    temperature: Union[float, None, UnsetType] = UNSET
+    humidity: Union[float, None, UnsetType] = UNSET
+    status: Union[str, None, UnsetType] = UNSET
+    is_archived: Union[bool, None, UnsetType] = UNSET
+
+
+# Every sensor data body goes through msgspec, so single, batch and update
+# requests coerce values alike. strict=False accepts numbers and booleans
+# sent as JSON strings ("20.5", "true", "0"); unlike pydantic's lax mode it
+# rejects padded numbers, booleans as numbers, "yes"/"on" and non-canonical
+# UUID spellings. Unit bodies are still validated by pydantic.
+_SENSOR_CREATE_DECODER = msgspec.json.Decoder(
+    SensorDataCreateFast,
+    strict=False
+)
+_SENSOR_CREATE_BATCH_DECODER = msgspec.json.Decoder(
+    List[SensorDataCreateFast],
+    strict=False
+)
+_SENSOR_UPDATE_DECODER = msgspec.json.Decoder(
+    SensorDataUpdateFast,
+    strict=False
+)
+
+
+def decode_sensor_create(raw: bytes) -> SensorDataCreateFast:
+    return _SENSOR_CREATE_DECODER.decode(raw)
+
+
+def decode_sensor_create_batch(raw: bytes) -> List[SensorDataCreateFast]:
+    return _SENSOR_CREATE_BATCH_DECODER.decode(raw)
+
+
+def decode_sensor_update(raw: bytes) -> SensorDataUpdateFast:
+    return _SENSOR_UPDATE_DECODER.decode(raw)
@@ -1,7 +1,13 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
+from app.schemas._fast import (
+    decode_sensor_create,
+    decode_sensor_create_batch,
+    decode_sensor_update
+)
 
 
 class SensorDataBase(BaseModel):
@@ -11,6 +17,9 @@ class SensorDataBase(BaseModel):
     status: str = Field(default="PENDING")
     is_archived: bool = Field(default=False)
 
+    # Plain data, never mutated after validation
+    model_config = ConfigDict(frozen=True)
+
 
 class SensorDataCreate(SensorDataBase):
     pass
@@ -20,9 +29,16 @@ class SensorData(SensorDataBase):
     id: UUID
     timestamp: datetime
 
-    model_config = {
-        'from_attributes': True
-    }
+    # Response-only models build their validators on first use instead of
+    # at import time
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
+class SensorDataBatchResult(BaseModel):
+    count: int
+    ids: List[UUID]
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
 
 
 class SensorDataUpdate(BaseModel):
@@ -31,6 +47,10 @@ class SensorDataUpdate(BaseModel):
     status: Optional[str] = None
     is_archived: Optional[bool] = None
 
+    # Unknown fields are rejected during validation, before the repository
+    # builds its UPDATE statement from the fields that were set
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
 
 class SensorDataStatistics(BaseModel):
     unit_id: UUID
@@ -39,3 +59,29 @@ class SensorDataStatistics(BaseModel):
     total_readings: int
     validated_readings: int
     archived_readings: int
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
+
+# Request bodies are decoded and type-checked by msgspec (see
+# app.schemas._fast); the results need no second pydantic validation.
+
+def validate_create(raw: bytes) -> SensorDataCreate:
+    item = decode_sensor_create(raw)
+    return SensorDataCreate.model_construct(**msgspec.structs.asdict(item))
+
+
+def validate_create_batch(raw: bytes) -> List[SensorDataCreate]:
+    return [
+        SensorDataCreate.model_construct(**msgspec.structs.asdict(item))
+        for item in decode_sensor_create_batch(raw)
+    ]
+
+
+def validate_update(raw: bytes) -> SensorDataUpdate:
+    item = decode_sensor_update(raw)
+    return SensorDataUpdate.model_construct(**{
+        name: value
+        for name, value in msgspec.structs.asdict(item).items()
+        if value is not msgspec.UNSET
+    })
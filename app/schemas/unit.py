@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from uuid import UUID
 from datetime import datetime
 
@@ -12,20 +12,22 @@ class UnitBase(BaseModel):
         description="Physical location of the unit."
     )
 
+    # Unknown fields are rejected rather than silently dropped; schemas are
+    # plain data and never mutated after validation
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
 # --- Request Schemas ---
 
 
 class UnitCreate(UnitBase):
-    pass
-
-    model_config = {
-        'json_schema_extra': {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Warehouse-A",
                 "location": "North Dock"
             }
         }
-    }
+    )
 
 
 class UnitUpdate(UnitBase):
@@ -34,15 +36,15 @@ class UnitUpdate(UnitBase):
         description="Status indicating if the unit is currently active."
     )
 
-    model_config = {
-        'json_schema_extra': {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Warehouse-A",
                 "location": "North Dock",
                 "is_active": True
             }
         }
-    }
+    )
 
 # --- Response Schemas ---
 
@@ -52,10 +54,12 @@ class UnitRead(UnitBase):
     is_active: bool
     created_at: datetime
 
-    # Allows mapping from database records (asyncpg.Record)
-    model_config = {
-        'from_attributes': True,
-        'json_schema_extra': {
+    # Allows mapping from database records (asyncpg.Record); built on
+    # first use since it is only needed for responses
+    model_config = ConfigDict(
+        from_attributes=True,
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "name": "Warehouse-A",
@@ -64,4 +68,18 @@ class UnitRead(UnitBase):
                 "created_at": "2025-01-01T10:00:00"
             }
         }
-    }
+    )
+
+# --- Request Validators ---
+
+
+_UNIT_CREATE_ADAPTER = TypeAdapter(UnitCreate)
+_UNIT_UPDATE_ADAPTER = TypeAdapter(UnitUpdate)
+
+
+def validate_create(raw: bytes) -> UnitCreate:
+    return _UNIT_CREATE_ADAPTER.validate_json(raw)
+
+
+def validate_update(raw: bytes) -> UnitUpdate:
+    return _UNIT_UPDATE_ADAPTER.validate_json(raw)
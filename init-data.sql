@@ -1,23 +1,150 @@
 -- init-data.sql
 -- Create tables (ensure your app handles table creation if not using migrations)
 CREATE TABLE IF NOT EXISTS units (
-    id UUID PRIMARY KEY,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     name VARCHAR(255) NOT NULL UNIQUE,
     location VARCHAR(255),
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
     created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Monthly range partitions on timestamp. The partition key has to be part
+-- of the primary key, so rows are identified by (id, timestamp).
 CREATE TABLE IF NOT EXISTS sensor_data (
-    id UUID PRIMARY KEY,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     unit_id UUID REFERENCES units(id) ON DELETE CASCADE,
-    timestamp TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     temperature NUMERIC,
     humidity NUMERIC,
     status VARCHAR(50) NOT NULL DEFAULT 'PENDING',
-    is_archived BOOLEAN NOT NULL DEFAULT FALSE
+    is_archived BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Serve "ORDER BY timestamp DESC LIMIT n" (optionally per unit) from
+-- ordered index scans of the newest partitions instead of a full sort
+CREATE INDEX IF NOT EXISTS sensor_data_timestamp_idx
+    ON sensor_data (timestamp DESC);
+CREATE INDEX IF NOT EXISTS sensor_data_unit_timestamp_idx
+    ON sensor_data (unit_id, timestamp DESC);
+
+-- Catches rows outside the created months. A month must be created before
+-- any of its rows land here, so keep partitions created ahead of time;
+-- the API does that at startup and daily (SENSOR_DATA_PARTITION_MONTHS).
+CREATE TABLE IF NOT EXISTS sensor_data_default
+    PARTITION OF sensor_data DEFAULT;
+
+CREATE OR REPLACE FUNCTION create_sensor_data_partition(for_month DATE)
+RETURNS VOID AS $$
+DECLARE
+    start_date DATE := date_trunc('month', for_month);
+    end_date DATE := start_date + INTERVAL '1 month';
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF sensor_data '
+        'FOR VALUES FROM (%L) TO (%L)',
+        'sensor_data_' || to_char(start_date, 'YYYY_MM'),
+        start_date,
+        end_date
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Current month and the next eleven
+SELECT create_sensor_data_partition(
+    (CURRENT_DATE + make_interval(months => m))::date
+)
+FROM generate_series(0, 11) AS m;
+
+-- Running per-unit aggregates, maintained by trigger so that statistics are
+-- an O(1) lookup instead of a scan over the unit's sensor data
+CREATE TABLE IF NOT EXISTS unit_stats (
+    unit_id UUID PRIMARY KEY REFERENCES units(id) ON DELETE CASCADE,
+    temperature_sum NUMERIC NOT NULL DEFAULT 0,
+    temperature_count BIGINT NOT NULL DEFAULT 0,
+    humidity_sum NUMERIC NOT NULL DEFAULT 0,
+    humidity_count BIGINT NOT NULL DEFAULT 0,
+    total_readings BIGINT NOT NULL DEFAULT 0,
+    validated_readings BIGINT NOT NULL DEFAULT 0,
+    archived_readings BIGINT NOT NULL DEFAULT 0
 );
 
+-- A statement-level trigger folds a whole COPY or multi-row INSERT into
+-- one upsert per unit; rows leaving a unit count -1, rows entering it +1.
+-- Transition tables exist only for the firing event and a trigger with
+-- them can only have one event, hence three triggers and dynamic SQL.
+CREATE OR REPLACE FUNCTION sensor_data_maintain_unit_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    new_sql TEXT := 'SELECT unit_id, temperature, humidity, status, '
+        || 'is_archived, 1 AS sign FROM new_rows';
+    old_sql TEXT := 'SELECT unit_id, temperature, humidity, status, '
+        || 'is_archived, -1 AS sign FROM old_rows';
+    changed_rows TEXT;
+BEGIN
+    changed_rows := CASE TG_OP
+        WHEN 'INSERT' THEN new_sql
+        WHEN 'DELETE' THEN old_sql
+        ELSE new_sql || ' UNION ALL ' || old_sql
+    END;
+
+    -- Units are upserted in unit_id order, so concurrent writers lock
+    -- their unit_stats rows in the same order and cannot deadlock
+    EXECUTE format($sql$
+        INSERT INTO unit_stats AS s (
+            unit_id, temperature_sum, temperature_count,
+            humidity_sum, humidity_count, total_readings,
+            validated_readings, archived_readings
+        )
+        SELECT
+            r.unit_id,
+            SUM(r.sign * COALESCE(r.temperature, 0)),
+            SUM(r.sign * (r.temperature IS NOT NULL)::int),
+            SUM(r.sign * COALESCE(r.humidity, 0)),
+            SUM(r.sign * (r.humidity IS NOT NULL)::int),
+            SUM(r.sign),
+            SUM(r.sign * (r.status = 'VALIDATED')::int),
+            SUM(r.sign * r.is_archived::int)
+        FROM (%s) AS r
+        -- Skips units being deleted, whose unit_stats row cascades away
+        WHERE r.unit_id IN (SELECT id FROM units)
+        GROUP BY r.unit_id
+        ORDER BY r.unit_id
+        ON CONFLICT (unit_id) DO UPDATE SET
+            temperature_sum = s.temperature_sum + EXCLUDED.temperature_sum,
+            temperature_count = s.temperature_count
+                + EXCLUDED.temperature_count,
+            humidity_sum = s.humidity_sum + EXCLUDED.humidity_sum,
+            humidity_count = s.humidity_count + EXCLUDED.humidity_count,
+            total_readings = s.total_readings + EXCLUDED.total_readings,
+            validated_readings = s.validated_readings
+                + EXCLUDED.validated_readings,
+            archived_readings = s.archived_readings
+                + EXCLUDED.archived_readings
+    $sql$, changed_rows);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- sensor_data_unit_stats is the earlier row-level trigger
+DROP TRIGGER IF EXISTS sensor_data_unit_stats ON sensor_data;
+DROP TRIGGER IF EXISTS sensor_data_unit_stats_insert ON sensor_data;
+DROP TRIGGER IF EXISTS sensor_data_unit_stats_update ON sensor_data;
+DROP TRIGGER IF EXISTS sensor_data_unit_stats_delete ON sensor_data;
+CREATE TRIGGER sensor_data_unit_stats_insert
+AFTER INSERT ON sensor_data
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION sensor_data_maintain_unit_stats();
+CREATE TRIGGER sensor_data_unit_stats_update
+AFTER UPDATE ON sensor_data
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION sensor_data_maintain_unit_stats();
+CREATE TRIGGER sensor_data_unit_stats_delete
+AFTER DELETE ON sensor_data
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION sensor_data_maintain_unit_stats();
+
 -- Insert sample data for units
 INSERT INTO units (id, name, location) VALUES
 ('b08499c7-5e6a-4d9b-a7f4-21915f01198c', 'Assembly-Line-1', 'Factory Floor 1'),
@@ -29,4 +156,31 @@ INSERT INTO sensor_data (id, unit_id, temperature, humidity, status) VALUES
 ('f47ac10b-58cc-4372-a567-0e02b2c3d479', 'b08499c7-5e6a-4d9b-a7f4-21915f01198c', 23.5, 45.2, 'VALIDATED'),
 ('550e8400-e29b-41d4-a716-446655440000', 'b08499c7-5e6a-4d9b-a7f4-21915f01198c', 24.1, 46.0, 'PENDING'),
 ('6ba7b810-9dad-11d1-80b4-00c04fd430c8', '1a3b5c7d-9e0f-11a2-b3c4-5d6e7f8a9b0c', 19.8, 52.3, 'PENDING')
-ON CONFLICT (id) DO NOTHING;
+ON CONFLICT DO NOTHING;
+
+-- Rebuilds unit_stats from sensor_data. Run it once on databases that
+-- held sensor data before unit_stats existed, before taking traffic;
+-- re-running it resets every unit's totals to the current rows.
+INSERT INTO unit_stats (
+    unit_id, temperature_sum, temperature_count,
+    humidity_sum, humidity_count, total_readings,
+    validated_readings, archived_readings
+)
+SELECT
+    unit_id,
+    COALESCE(SUM(temperature), 0), COUNT(temperature),
+    COALESCE(SUM(humidity), 0), COUNT(humidity),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'VALIDATED'),
+    COUNT(*) FILTER (WHERE is_archived)
+FROM sensor_data
+WHERE unit_id IS NOT NULL
+GROUP BY unit_id
+ON CONFLICT (unit_id) DO UPDATE SET
+    temperature_sum = EXCLUDED.temperature_sum,
+    temperature_count = EXCLUDED.temperature_count,
+    humidity_sum = EXCLUDED.humidity_sum,
+    humidity_count = EXCLUDED.humidity_count,
+    total_readings = EXCLUDED.total_readings,
+    validated_readings = EXCLUDED.validated_readings,
+    archived_readings = EXCLUDED.archived_readings;
@@ -1,46 +1,93 @@
 # tests/conftest.py
+import os
 import pytest
 import pytest_asyncio
+from pytest_asyncio import is_async_test
 from unittest.mock import AsyncMock
 from httpx import AsyncClient
 from httpx._transports.asgi import ASGITransport
 from fastapi import FastAPI
 import asyncpg
-from uuid import UUID
+import redis.asyncio as redis
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Mapping
+from uuid import UUID, uuid4
 
+# Settings() is built on import of app.core.config and requires the DB
+# variables; tests never connect, so placeholders do not need a .env file
+for _name, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+}.items():
+    os.environ.setdefault(_name, _value)
 
-# Using pytest-asyncio's built-in event_loop fixture instead
-# For module scope, use @pytest.mark.asyncio(scope="module") on test functions
+# The one unit the mocked repositories treat as existing
+_VALID_UNIT_UUID = UUID("123e4567-e89b-12d3-a456-426614174000")
 
 
-@pytest_asyncio.fixture
-async def mock_db():
+def _as_uuid(value) -> UUID:
+    """Normalizes ids once so the mocks compare UUIDs, not strings."""
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def pytest_collection_modifyitems(items):
+    """Runs every async test in the session event loop.
+
+    The shared ``client`` lives in that loop, so the tests using it have to
+    run there as well.
+    """
+    session_loop = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture
+def mock_db():
     """Create a mock database connection."""
     mock_conn = AsyncMock()
     return mock_conn
 
 
-@pytest_asyncio.fixture
-async def mock_db_connection(mock_db, monkeypatch):
+@pytest.fixture
+def mock_db_connection(mock_db, app: FastAPI):
     """Provide a mock database connection for dependency injection."""
+    from app.core.database import get_db_pool
+
     async def _mock_pool():
         return mock_db
 
-    # Patch the database pool getter used in the endpoints
-    monkeypatch.setattr("app.core.database.get_db_pool", _mock_pool)
-    return mock_db
+    # Override the database pool dependency used by the endpoints
+    app.dependency_overrides[get_db_pool] = _mock_pool
+    yield mock_db
+    app.dependency_overrides.pop(get_db_pool, None)
+
 
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """The application under test, built once for the whole session.
 
-@pytest_asyncio.fixture
-async def app() -> FastAPI:
-    """Create a FastAPI test application."""
+    Imported here rather than at module level so building the app (and
+    its schemas) happens on first use, not while pytest loads conftest.
+
+    Tests swap dependencies through ``app.dependency_overrides`` and must
+    remove their overrides again (see ``mock_db_connection``).
+    """
     from app.main import app
     return app
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 async def client(app: FastAPI):
-    """Create an async client for testing."""
+    """One async client shared by every test.
+
+    Per-test isolation comes from the function-scoped fixtures that patch
+    repositories and dependency overrides, not from fresh clients.
+    """
     transport = ASGITransport(app=app)
     async with AsyncClient(
         transport=transport,
@@ -69,152 +116,203 @@ def mock_unit_repo(mocker):
     return mock_repo
 
 
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+class TimingOutRedis:
+    """Redis client stand-in whose every command times out."""
+
+    async def get(self, key):
+        raise redis.TimeoutError("Timeout reading from socket")
+
+    async def setex(self, key, ttl, value):
+        raise redis.TimeoutError("Timeout reading from socket")
+
+    async def delete(self, key):
+        raise redis.TimeoutError("Timeout reading from socket")
+
+
 @pytest.fixture
-def valid_sensor_data() -> dict:
-    return {
-        "unit_id": "123e4567-e89b-12d3-a456-426614174000",
-        "temperature": 25.5,
-        "humidity": 60.0,
-        "status": "PENDING",
-        "is_archived": False
-    }
+def timing_out_cache(monkeypatch):
+    """Enable the response cache against a Redis that never answers."""
+    cache = TimingOutRedis()
+    monkeypatch.setattr("app.core.cache.client", cache)
+    return cache
 
 
 @pytest.fixture
-def mock_sensor_repo(mocker, valid_sensor_data):
-    """Create a mock sensor data repository with state management."""
-    mock_repo = mocker.AsyncMock()
+def fake_cache(monkeypatch):
+    """Enable the response cache backed by an in-memory store."""
+    cache = FakeRedis()
+    monkeypatch.setattr("app.core.cache.client", cache)
+    return cache
+
+
+# Read-only so one instance can be shared by every test; copy it with
+# dict(...) before changing it or passing it as a JSON body
+_VALID_SENSOR_DATA = MappingProxyType({
+    "unit_id": str(_VALID_UNIT_UUID),
+    "temperature": 25.5,
+    "humidity": 60.0,
+    "status": "PENDING",
+    "is_archived": False
+})
+
+# Template every mocked record is copied from
+_BASE_RECORD = MappingProxyType({
+    **_VALID_SENSOR_DATA,
+    'id': '123e4567-e89b-12d3-a456-426614174000',
+    'unit_id': _VALID_UNIT_UUID,
+    'timestamp': '2023-01-01T00:00:00'
+})
+
+
+@pytest.fixture(scope="session")
+def valid_sensor_data() -> Mapping:
+    return _VALID_SENSOR_DATA
+
+
+class FakeSensorRepo:
+    """In-memory stand-in for SensorDataRepository.
+
+    Plain methods over real dicts keep the mocked calls cheap. Records are
+    kept by id, plus a secondary index of the same records by unit id.
+    """
+
+    def __init__(self):
+        self.stored_data = {}
+        self.unit_index: defaultdict[UUID, dict] = defaultdict(dict)
+
+    def _store(self, record):
+        self.stored_data[str(record['id'])] = record
+        self.unit_index[record['unit_id']][str(record['id'])] = record
+
+    async def check_unit_exists(self, unit_id):
+        """Foreign key check: only the valid test unit exists."""
+        try:
+            return _as_uuid(unit_id) == _VALID_UNIT_UUID
+        except (ValueError, TypeError):
+            return False
 
-    # Store for keeping track of created/updated records
-    stored_data = {}
-
-    # Base record template
-    base_record = {
-        'id': '123e4567-e89b-12d3-a456-426614174000',
-        'unit_id': valid_sensor_data["unit_id"],
-        'temperature': valid_sensor_data["temperature"],
-        'humidity': valid_sensor_data["humidity"],
-        'status': valid_sensor_data["status"],
-        'is_archived': valid_sensor_data["is_archived"],
-        'timestamp': '2023-01-01T00:00:00'
-    }
-
-    # Mock get_by_id to return data from our store
-    async def mock_get_by_id(id_):
-        return stored_data.get(str(id_))
-    mock_repo.get_by_id.side_effect = mock_get_by_id
-
-    # Mock create to store and return created data
-    async def mock_create(data):
+    async def get_by_id(self, id_):
+        return self.stored_data.get(str(id_))
+
+    async def create(self, data):
         try:
-            # Try to get the data as dict (support both v1 and v2)
-            try:
-                data_dict = data.model_dump()
-            except AttributeError:
-                data_dict = data.dict()
+            data_dict = data.model_dump()
 
             # Check if unit exists
             if not isinstance(data.unit_id, UUID):
                 raise ValueError("Invalid UUID format")
-
-            unit_exists = await mock_repo.check_unit_exists(data.unit_id)
-            if not unit_exists:
+            if not await self.check_unit_exists(data.unit_id):
                 raise asyncpg.exceptions.ForeignKeyViolationError()
 
-            record = {**base_record, **data_dict}
-            stored_data[str(record['id'])] = record
+            record = {**_BASE_RECORD, **data_dict}
+            self._store(record)
             return record
         except (ValueError, TypeError, AttributeError) as e:
-            print(f"Create error: {e}")  # For debugging
-            raise ValueError("Invalid data format")
-    mock_repo.create.side_effect = mock_create
+            raise ValueError("Invalid data format") from e
 
-    # Mock update to modify stored data
-    async def mock_update(id_, update_data):
-        if str(id_) not in stored_data:
+    async def create_many(self, items):
+        for item in items:
+            if not await self.check_unit_exists(item.unit_id):
+                raise asyncpg.exceptions.ForeignKeyViolationError()
+        ids = []
+        for item in items:
+            record = {**_BASE_RECORD, **item.model_dump(), 'id': str(uuid4())}
+            self._store(record)
+            ids.append(record['id'])
+        return ids
+
+    async def update(self, id_, update_data):
+        if str(id_) not in self.stored_data:
             return None
-        try:
-            # Try both Pydantic v2 and v1 methods
-            try:
-                data_dict = update_data.model_dump(exclude_unset=True)
-            except AttributeError:
-                data_dict = update_data.dict(exclude_unset=True)
-
-            # Validate fields
-            valid_fields = {"temperature", "humidity", "status", "is_archived"}
-            if not all(k in valid_fields for k in data_dict.keys()):
-                raise ValueError("Invalid fields in update")
-
-            updated = {**stored_data[str(id_)], **data_dict}
-            stored_data[str(id_)] = updated
-            return updated
-        except (ValueError, TypeError, AttributeError) as e:
-            print(f"Update error: {e}")  # For debugging
-            raise ValueError(str(e))
-    mock_repo.update.side_effect = mock_update
-
-    # Mock delete to remove from stored data
-    async def mock_delete(id_):
-        if str(id_) not in stored_data:
-            return False
-        del stored_data[str(id_)]
-        return True
-    mock_repo.delete.side_effect = mock_delete
+        # SensorDataUpdate already rejects unknown fields; updated in place
+        # so the unit index sees the change too
+        updated = self.stored_data[str(id_)]
+        updated.update(update_data.model_dump(exclude_unset=True))
+        return updated
+
+    async def delete(self, id_):
+        record = self.stored_data.pop(str(id_), None)
+        if record is None:
+            return None
+        del self.unit_index[record['unit_id']][str(id_)]
+        return id_
 
-    # Mock archive to update stored data
-    async def mock_archive(id_):
-        if str(id_) not in stored_data:
+    async def archive_data(self, id_):
+        record = self.stored_data.get(str(id_))
+        if record is None:
             return None
-        stored_data[str(id_)]['is_archived'] = True
-        return stored_data[str(id_)]
-    mock_repo.archive_data.side_effect = mock_archive
+        record['is_archived'] = True
+        return record
 
-    # Mock get_unit_statistics
-    async def mock_get_stats(unit_id):
+    async def get_unit_statistics(self, unit_id):
+        """Accumulates, in a single pass, the unit_stats running totals."""
         try:
-            unit_data = [d for d in stored_data.values() if str(
-                d['unit_id']) == str(unit_id)]
-            if not unit_data:
-                return None
-
-            validated = [d for d in unit_data if d['status'] == 'VALIDATED']
-            archived = [d for d in unit_data if d['is_archived']]
-
-            return {
-                'unit_id': str(unit_id),
-                'avg_temperature': sum(
-                    d['temperature'] for d in unit_data) / len(unit_data),
-                'avg_humidity': sum(
-                    d['humidity'] for d in unit_data) / len(unit_data),
-                'total_readings': len(unit_data),
-                'validated_readings': len(validated),
-                'archived_readings': len(archived)
-            }
-        except (ValueError, TypeError):
-            raise ValueError("Invalid unit ID")
-    mock_repo.get_unit_statistics.side_effect = mock_get_stats
+            uid = _as_uuid(unit_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid unit ID") from e
+
+        total = validated = archived = 0
+        t_sum = h_sum = 0.0
+        t_count = h_count = 0
+        for d in self.unit_index.get(uid, {}).values():
+            total += 1
+            if d['temperature'] is not None:
+                t_sum += d['temperature']
+                t_count += 1
+            if d['humidity'] is not None:
+                h_sum += d['humidity']
+                h_count += 1
+            validated += d['status'] == 'VALIDATED'
+            archived += d['is_archived']
+        if not total:
+            return None
+
+        return {
+            'unit_id': uid,
+            'avg_temperature': t_sum / t_count if t_count else None,
+            'avg_humidity': h_sum / h_count if h_count else None,
+            'total_readings': total,
+            'validated_readings': validated,
+            'archived_readings': archived
+        }
 
-    # Mock get_all
-    async def mock_get_all(limit=100, offset=0, unit_id=None):
+    async def get_all(self, limit=100, offset=0, unit_id=None):
         if unit_id:
-            return [d for d in stored_data.values()
-                    if str(d['unit_id']) == str(unit_id)][offset:offset+limit]
-        return list(stored_data.values())[offset:offset+limit]
-    mock_repo.get_all.side_effect = mock_get_all
+            records = self.unit_index.get(_as_uuid(unit_id), {})
+            return list(records.values())[offset:offset+limit]
+        return list(self.stored_data.values())[offset:offset+limit]
 
-    # Mock check_unit_exists for foreign key validation
-    async def mock_check_unit_exists(unit_id):
-        try:
-            str_unit_id = str(unit_id)
-            return str_unit_id == valid_sensor_data["unit_id"]
-        except (ValueError, TypeError):
-            return False
-    mock_repo.check_unit_exists = mock_check_unit_exists
+    async def stream(self, unit_id=None, limit=None):
+        records = await self.get_all(
+            limit=len(self.stored_data) if limit is None else limit,
+            unit_id=unit_id
+        )
+        for record in records:
+            yield record
 
-    # Patch the repository instantiation
+
+@pytest.fixture
+def mock_sensor_repo(mocker):
+    """Patch the endpoints to use a fresh in-memory sensor repository."""
+    repo = FakeSensorRepo()
     mocker.patch(
         'app.api.v1.endpoints.sensor_data.SensorDataRepository',
-        return_value=mock_repo
+        return_value=repo
     )
-
-    return mock_repo
+    return repo
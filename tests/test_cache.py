@@ -0,0 +1,19 @@
+import pytest
+from app.core import cache
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_connect_cache_sets_socket_timeouts(mocker, monkeypatch):
+    """The client is created with bounded connect and command timeouts."""
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://cache:6379/0")
+    monkeypatch.setattr(cache, "client", None)
+    from_url = mocker.patch("app.core.cache.redis.from_url")
+
+    await cache.connect_cache()
+
+    from_url.assert_called_once_with(
+        "redis://cache:6379/0",
+        socket_connect_timeout=settings.CACHE_CONNECT_TIMEOUT,
+        socket_timeout=settings.CACHE_SOCKET_TIMEOUT
+    )
@@ -0,0 +1,63 @@
+import asyncpg
+import pytest
+from app.core.database import PreparedConnection
+
+QUERY = "SELECT 1;"
+
+
+class _StubConnection:
+    """Just enough of a PreparedConnection; prepare() hands out stubs."""
+
+    prepared = PreparedConnection.prepared
+
+    def __init__(self, mocker, *statements, in_transaction=False):
+        self._prepared = {}
+        self.prepare = mocker.AsyncMock(side_effect=statements)
+        self.is_in_transaction = mocker.Mock(return_value=in_transaction)
+
+
+def _stale_statement(mocker):
+    stmt = mocker.AsyncMock()
+    stmt.fetchval.side_effect = (
+        asyncpg.exceptions.InvalidCachedStatementError()
+    )
+    return stmt
+
+
+@pytest.mark.asyncio
+async def test_prepared_reuses_statement(mocker):
+    """The same query is prepared once per connection."""
+    stmt = mocker.AsyncMock()
+    conn = _StubConnection(mocker, stmt)
+
+    await (await conn.prepared(QUERY)).fetchval()
+    await (await conn.prepared(QUERY)).fetchval()
+
+    conn.prepare.assert_awaited_once_with(QUERY)
+    assert stmt.fetchval.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_prepared_reprepares_stale_statement(mocker):
+    """An invalidated statement is replaced and the call retried once."""
+    fresh = mocker.AsyncMock()
+    fresh.fetchval.return_value = 1
+    conn = _StubConnection(mocker, _stale_statement(mocker), fresh)
+    stmt = await conn.prepared(QUERY)
+
+    assert await stmt.fetchval() == 1
+    assert conn.prepare.await_count == 2
+    assert conn._prepared[QUERY] is fresh
+
+
+@pytest.mark.asyncio
+async def test_prepared_stale_statement_in_transaction(mocker):
+    """Inside a transaction the error is raised, but the handle dropped."""
+    conn = _StubConnection(
+        mocker, _stale_statement(mocker), in_transaction=True
+    )
+    stmt = await conn.prepared(QUERY)
+
+    with pytest.raises(asyncpg.exceptions.InvalidCachedStatementError):
+        await stmt.fetchval()
+    assert QUERY not in conn._prepared
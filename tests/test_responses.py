@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+import orjson
+from app.core.responses import dumps
+
+
+def test_dumps_encodes_row_values():
+    """NUMERIC, UUID and timestamp columns serialize without a model."""
+    row = {
+        "id": UUID("00000000-0000-0000-0000-00000000000a"),
+        "temperature": Decimal("25.5"),
+        "timestamp": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    }
+
+    assert orjson.loads(dumps(row)) == {
+        "id": "00000000-0000-0000-0000-00000000000a",
+        "temperature": 25.5,
+        "timestamp": "2025-01-01T00:00:00+00:00",
+    }
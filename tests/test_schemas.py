@@ -0,0 +1,87 @@
+import json
+import msgspec
+import pytest
+from app.schemas import sensor_data
+from app.schemas._fast import SensorDataCreateFast, SensorDataUpdateFast
+from app.schemas.sensor_data import SensorDataCreate, SensorDataUpdate
+
+UNIT_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+def test_fast_create_struct_matches_schema():
+    """The msgspec create struct mirrors SensorDataCreate field for field."""
+    struct_fields = {
+        field.name: field.default
+        for field in msgspec.structs.fields(SensorDataCreateFast)
+    }
+    model_fields = {
+        name: field.get_default()
+        for name, field in SensorDataCreate.model_fields.items()
+    }
+    # Required fields report NODEFAULT and PydanticUndefined respectively
+    required = {
+        name for name, default in struct_fields.items()
+        if default is msgspec.NODEFAULT
+    }
+    assert struct_fields.keys() == model_fields.keys()
+    assert required == {
+        name for name, field in SensorDataCreate.model_fields.items()
+        if field.is_required()
+    }
+    for name in struct_fields.keys() - required:
+        assert struct_fields[name] == model_fields[name], name
+
+
+def test_fast_update_struct_matches_schema():
+    """The msgspec update struct has SensorDataUpdate's fields."""
+    struct_fields = {
+        field.name for field in msgspec.structs.fields(SensorDataUpdateFast)
+    }
+    assert struct_fields == SensorDataUpdate.model_fields.keys()
+
+
+def _accepted(validate, body) -> bool:
+    try:
+        validate(json.dumps(body).encode())
+    except msgspec.DecodeError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("field, value, accepted", [
+    ("temperature", 20.5, True),
+    ("temperature", "20.5", True),
+    ("temperature", " 20.5", False),
+    ("temperature", True, False),
+    ("is_archived", "true", True),
+    ("is_archived", 1, True),
+    ("is_archived", "yes", False),
+    ("is_archived", "on", False),
+])
+def test_sensor_bodies_coerce_alike(field, value, accepted):
+    """Single, batch and update bodies accept exactly the same values."""
+    item = {"unit_id": UNIT_ID, field: value}
+
+    assert _accepted(sensor_data.validate_create, item) is accepted
+    assert _accepted(sensor_data.validate_create_batch, [item]) is accepted
+    assert _accepted(sensor_data.validate_update, {field: value}) is accepted
+
+
+@pytest.mark.parametrize("unit_id, accepted", [
+    (UNIT_ID, True),
+    (f"urn:uuid:{UNIT_ID}", False),
+    (f"{{{UNIT_ID}}}", False),
+])
+def test_sensor_create_unit_id_spellings(unit_id, accepted):
+    """Single and batch creates agree on which UUID spellings are valid."""
+    item = {"unit_id": unit_id}
+
+    assert _accepted(sensor_data.validate_create, item) is accepted
+    assert _accepted(sensor_data.validate_create_batch, [item]) is accepted
+
+
+def test_sensor_update_keeps_fields_set():
+    """Only the fields sent in an update count as set."""
+    update = sensor_data.validate_update(b'{"temperature": 30.0}')
+
+    assert update.model_dump(exclude_unset=True) == {"temperature": 30.0}
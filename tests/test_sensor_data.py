@@ -1,43 +1,24 @@
+import json
 import pytest
+from typing import Mapping
 from uuid import UUID
 from fastapi import FastAPI
 from httpx import AsyncClient
-# No schema imports needed for tests
-from app.api.v1.endpoints.sensor_data import router as sensor_data_router
 
-
-@pytest.fixture
-def app(mock_db, mock_sensor_repo) -> FastAPI:
-    """
-    Create a FastAPI test application with the sensor data router.
-    Uses the mock_db fixture that's already available.
-    """
-    app = FastAPI()
-    app.include_router(sensor_data_router, prefix="/api/v1")
-    return app
-
-
-@pytest.fixture
-def valid_sensor_data() -> dict:
-    return {
-        "unit_id": "123e4567-e89b-12d3-a456-426614174000",
-        "temperature": 25.5,
-        "humidity": 60.0,
-        "status": "PENDING",
-        "is_archived": False
-    }
+# Every test runs against the shared app with the repository mocked out
+pytestmark = pytest.mark.usefixtures("mock_db_connection", "mock_sensor_repo")
 
 
 @pytest.mark.asyncio
 async def test_create_sensor_data(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test creating new sensor data."""
     response = await client.post(
-        "/api/v1/sensor-data/",
-        json=valid_sensor_data
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
     )
     assert response.status_code == 201
 
@@ -51,23 +32,82 @@ async def test_create_sensor_data(
     assert "timestamp" in data
 
 
+@pytest.mark.asyncio
+async def test_create_sensor_data_batch(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test bulk creation of sensor data."""
+    batch = [
+        dict(valid_sensor_data),
+        {**valid_sensor_data, "temperature": 30.0}
+    ]
+    response = await client.post("/v1/sensor-data/batch", json=batch)
+    assert response.status_code == 201
+
+    data = response.json()
+    assert data["count"] == len(batch)
+    assert len(data["ids"]) == len(batch)
+    assert all(UUID(record_id) for record_id in data["ids"])
+
+
+@pytest.mark.asyncio
+async def test_create_sensor_data_batch_invalid_unit(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test bulk creation referencing a non-existent unit."""
+    unknown_unit_id = "123e4567-e89b-12d3-a456-426614174999"
+    batch = [
+        dict(valid_sensor_data),
+        {**valid_sensor_data, "unit_id": unknown_unit_id}
+    ]
+    response = await client.post("/v1/sensor-data/batch", json=batch)
+    assert response.status_code == 404
+    assert "does not exist" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_create_sensor_data_batch_invalid_body(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test that malformed batch items are rejected before the repo."""
+    batch = [
+        dict(valid_sensor_data),
+        {**valid_sensor_data, "unit_id": "nope"}
+    ]
+    response = await client.post("/v1/sensor-data/batch", json=batch)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "unit_id"]
+
+    response = await client.post(
+        "/v1/sensor-data/batch",
+        content=b"not json"
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_get_sensor_data(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test retrieving sensor data by ID."""
     # First create a sensor data record
     response = await client.post(
-        "/api/v1/sensor-data/",
-        json=valid_sensor_data
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
     )
     created_data = response.json()
     sensor_data_id = created_data["id"]
 
     # Then retrieve it
-    response = await client.get(f"/api/v1/sensor-data/{sensor_data_id}")
+    response = await client.get(f"/v1/sensor-data/{sensor_data_id}")
     assert response.status_code == 200
 
     data = response.json()
@@ -79,7 +119,7 @@ async def test_get_sensor_data(
 @pytest.mark.asyncio
 async def test_list_sensor_data(app: FastAPI, client: AsyncClient):
     """Test listing all sensor data records."""
-    response = await client.get("/api/v1/sensor-data/")
+    response = await client.get("/v1/sensor-data/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
@@ -88,15 +128,15 @@ async def test_list_sensor_data(app: FastAPI, client: AsyncClient):
 async def test_list_sensor_data_by_unit(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test listing sensor data filtered by unit."""
     # First create some sensor data
-    await client.post("/api/v1/sensor-data/", json=valid_sensor_data)
+    await client.post("/v1/sensor-data/", json=dict(valid_sensor_data))
 
     # Then retrieve by unit_id
     unit_id = valid_sensor_data["unit_id"]
-    response = await client.get(f"/api/v1/sensor-data/?unit_id={unit_id}")
+    response = await client.get(f"/v1/sensor-data/?unit_id={unit_id}")
     assert response.status_code == 200
 
     data = response.json()
@@ -104,17 +144,66 @@ async def test_list_sensor_data_by_unit(
     assert all(item["unit_id"] == unit_id for item in data)
 
 
+@pytest.mark.asyncio
+async def test_stream_sensor_data(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test streaming sensor data as NDJSON."""
+    batch = [
+        dict(valid_sensor_data),
+        {**valid_sensor_data, "temperature": 30.0}
+    ]
+    await client.post("/v1/sensor-data/batch", json=batch)
+
+    unit_id = valid_sensor_data["unit_id"]
+    response = await client.get(
+        f"/v1/sensor-data/stream?unit_id={unit_id}"
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == len(batch)
+    assert all(row["unit_id"] == unit_id for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_list_sensor_data_compressed(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test that large listings are gzipped and small bodies are not."""
+    batch = [dict(valid_sensor_data) for _ in range(20)]
+    await client.post("/v1/sensor-data/batch", json=batch)
+
+    headers = {"Accept-Encoding": "gzip"}
+    response = await client.get("/v1/sensor-data/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == len(batch)
+
+    unit_id = valid_sensor_data["unit_id"]
+    response = await client.get(
+        f"/v1/sensor-data/unit/{unit_id}/statistics",
+        headers=headers
+    )
+    assert "content-encoding" not in response.headers
+
+
 @pytest.mark.asyncio
 async def test_update_sensor_data(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test updating sensor data."""
     # First create a sensor data record
     response = await client.post(
-        "/api/v1/sensor-data/",
-        json=valid_sensor_data
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
     )
     sensor_data_id = response.json()["id"]
 
@@ -124,7 +213,7 @@ async def test_update_sensor_data(
         "status": "VALIDATED"
     }
     response = await client.put(
-        f"/api/v1/sensor-data/{sensor_data_id}",
+        f"/v1/sensor-data/{sensor_data_id}",
         json=update_data
     )
     assert response.status_code == 200
@@ -139,22 +228,22 @@ async def test_update_sensor_data(
 async def test_delete_sensor_data(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test deleting sensor data."""
     # First create a sensor data record
     response = await client.post(
-        "/api/v1/sensor-data/",
-        json=valid_sensor_data
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
     )
     sensor_data_id = response.json()["id"]
 
     # Delete it
-    response = await client.delete(f"/api/v1/sensor-data/{sensor_data_id}")
+    response = await client.delete(f"/v1/sensor-data/{sensor_data_id}")
     assert response.status_code == 204
 
     # Verify it's deleted
-    get_response = await client.get(f"/api/v1/sensor-data/{sensor_data_id}")
+    get_response = await client.get(f"/v1/sensor-data/{sensor_data_id}")
     assert get_response.status_code == 404
 
 
@@ -162,15 +251,15 @@ async def test_delete_sensor_data(
 async def test_get_unit_statistics(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test retrieving unit statistics."""
     # Create some sensor data for the unit
-    await client.post("/api/v1/sensor-data/", json=valid_sensor_data)
+    await client.post("/v1/sensor-data/", json=dict(valid_sensor_data))
 
     # Get statistics
     unit_id = valid_sensor_data["unit_id"]
-    url = f"/api/v1/sensor-data/unit/{unit_id}/statistics"
+    url = f"/v1/sensor-data/unit/{unit_id}/statistics"
     response = await client.get(url)
     assert response.status_code == 200
 
@@ -187,19 +276,19 @@ async def test_get_unit_statistics(
 async def test_archive_sensor_data(
     app: FastAPI,
     client: AsyncClient,
-    valid_sensor_data: dict
+    valid_sensor_data: Mapping
 ):
     """Test archiving sensor data."""
     # First create a sensor data record
     response = await client.post(
-        "/api/v1/sensor-data/",
-        json=valid_sensor_data
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
     )
     sensor_data_id = response.json()["id"]
 
     # Archive it
     response = await client.post(
-        f"/api/v1/sensor-data/{sensor_data_id}/archive"
+        f"/v1/sensor-data/{sensor_data_id}/archive"
     )
     assert response.status_code == 200
 
@@ -223,11 +312,46 @@ async def test_create_sensor_data_invalid_unit(
         "status": "PENDING",
         "is_archived": False
     }
-    response = await client.post("/api/v1/sensor-data/", json=invalid_data)
+    response = await client.post("/v1/sensor-data/", json=invalid_data)
     assert response.status_code == 404
     assert "does not exist" in response.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+async def test_create_sensor_data_invalid_body(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test that malformed records are rejected with a 422."""
+    response = await client.post(
+        "/v1/sensor-data/",
+        json={**valid_sensor_data, "temperature": "hot"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "temperature"]
+
+
+@pytest.mark.asyncio
+async def test_create_sensor_data_coerces_strings(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test that numeric and boolean strings are accepted like elsewhere."""
+    response = await client.post(
+        "/v1/sensor-data/",
+        json={
+            **valid_sensor_data,
+            "temperature": "20.5",
+            "is_archived": "true"
+        }
+    )
+    assert response.status_code == 201
+    assert response.json()["temperature"] == 20.5
+    assert response.json()["is_archived"] is True
+
+
 @pytest.mark.asyncio
 async def test_get_nonexistent_sensor_data(
     app: FastAPI,
@@ -235,7 +359,7 @@ async def test_get_nonexistent_sensor_data(
 ):
     """Test retrieving non-existent sensor data."""
     fake_id = "123e4567-e89b-12d3-a456-426614174999"
-    response = await client.get(f"/api/v1/sensor-data/{fake_id}")
+    response = await client.get(f"/v1/sensor-data/{fake_id}")
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
@@ -249,13 +373,34 @@ async def test_update_nonexistent_sensor_data(
     fake_id = "123e4567-e89b-12d3-a456-426614174999"
     update_data = {"temperature": 26.5}
     response = await client.put(
-        f"/api/v1/sensor-data/{fake_id}",
+        f"/v1/sensor-data/{fake_id}",
         json=update_data
     )
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+async def test_update_sensor_data_unknown_field(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test that updates naming unknown fields are rejected."""
+    response = await client.post(
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
+    )
+    sensor_data_id = response.json()["id"]
+
+    response = await client.put(
+        f"/v1/sensor-data/{sensor_data_id}",
+        json={"temperature": 26.5, "unit_id": valid_sensor_data["unit_id"]}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "unit_id"]
+
+
 @pytest.mark.asyncio
 async def test_get_statistics_no_data(
     app: FastAPI,
@@ -264,7 +409,118 @@ async def test_get_statistics_no_data(
     """Test getting statistics for a unit with no sensor data."""
     fake_unit_id = "123e4567-e89b-12d3-a456-426614174999"
     response = await client.get(
-        f"/api/v1/sensor-data/unit/{fake_unit_id}/statistics"
+        f"/v1/sensor-data/unit/{fake_unit_id}/statistics"
     )
     assert response.status_code == 404
     assert "no sensor data found" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_delete_nonexistent_sensor_data(
+    app: FastAPI,
+    client: AsyncClient
+):
+    """Test deleting non-existent sensor data."""
+    fake_id = "123e4567-e89b-12d3-a456-426614174999"
+    response = await client.delete(f"/v1/sensor-data/{fake_id}")
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_archive_nonexistent_sensor_data(
+    app: FastAPI,
+    client: AsyncClient
+):
+    """Test archiving non-existent sensor data."""
+    fake_id = "123e4567-e89b-12d3-a456-426614174999"
+    response = await client.post(f"/v1/sensor-data/{fake_id}/archive")
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_get_sensor_data_served_from_cache(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping,
+    mock_sensor_repo,
+    fake_cache,
+    mocker
+):
+    """Test that repeated reads of a record are served from the cache."""
+    get_by_id = mocker.spy(mock_sensor_repo, "get_by_id")
+    response = await client.post(
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
+    )
+    sensor_data_id = response.json()["id"]
+
+    first = await client.get(f"/v1/sensor-data/{sensor_data_id}")
+    second = await client.get(f"/v1/sensor-data/{sensor_data_id}")
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert get_by_id.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update_sensor_data_invalidates_cache(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping,
+    fake_cache
+):
+    """Test that updating a record drops its cached representation."""
+    response = await client.post(
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
+    )
+    sensor_data_id = response.json()["id"]
+    await client.get(f"/v1/sensor-data/{sensor_data_id}")
+
+    await client.put(
+        f"/v1/sensor-data/{sensor_data_id}",
+        json={"temperature": 30.0}
+    )
+    response = await client.get(f"/v1/sensor-data/{sensor_data_id}")
+    assert response.json()["temperature"] == 30.0
+
+
+@pytest.mark.asyncio
+async def test_cache_timeouts_fall_through_to_database(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping,
+    timing_out_cache
+):
+    """Test that a Redis timeout neither fails reads nor committed writes."""
+    response = await client.post(
+        "/v1/sensor-data/",
+        json=dict(valid_sensor_data)
+    )
+    sensor_data_id = response.json()["id"]
+
+    response = await client.get(f"/v1/sensor-data/{sensor_data_id}")
+    assert response.status_code == 200
+
+    response = await client.put(
+        f"/v1/sensor-data/{sensor_data_id}",
+        json={"temperature": 30.0}
+    )
+    assert response.status_code == 200
+    assert response.json()["temperature"] == 30.0
+
+
+@pytest.mark.asyncio
+async def test_create_and_batch_reject_the_same_body(
+    app: FastAPI,
+    client: AsyncClient,
+    valid_sensor_data: Mapping
+):
+    """Test that single and batch creates validate values alike."""
+    item = {**valid_sensor_data, "temperature": True}
+
+    single = await client.post("/v1/sensor-data/", json=item)
+    batch = await client.post("/v1/sensor-data/batch", json=[item])
+    assert single.status_code == batch.status_code == 422
+    assert batch.json()["detail"][0]["loc"] == ["body", 0, "temperature"]
@@ -0,0 +1,90 @@
+import asyncpg
+import pytest
+from uuid import UUID
+from app.crud.sensor_data_repo import (
+    COPY_MIN_BATCH_SIZE,
+    SQL_ENSURE_PARTITIONS,
+    SQL_PARTITION_LOCK,
+    SensorDataRepository
+)
+from app.schemas.sensor_data import SensorDataCreate
+
+UNIT_A = UUID("00000000-0000-0000-0000-00000000000a")
+UNIT_B = UUID("00000000-0000-0000-0000-00000000000b")
+
+
+def test_batch_records_keep_input_order():
+    """Each generated id is paired with its item, in input order."""
+    items = [
+        SensorDataCreate(unit_id=UNIT_B, temperature=1.0),
+        SensorDataCreate(unit_id=UNIT_A, temperature=2.0),
+    ]
+    ids, records = SensorDataRepository._batch_records(items)
+
+    assert [record[0] for record in records] == ids
+    assert [record[1:3] for record in records] == [
+        (UNIT_B, 1.0), (UNIT_A, 2.0)
+    ]
+
+
+def _stub_pool(mocker):
+    """A pool whose acquire() hands out one AsyncMock connection."""
+    conn = mocker.AsyncMock()
+    # transaction() is a plain call returning an async context manager
+    conn.transaction = mocker.MagicMock()
+    pool = mocker.MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = conn
+    return pool, conn
+
+
+@pytest.mark.asyncio
+async def test_create_many_propagates_missing_unit(mocker):
+    """Foreign key errors reach the endpoint, which maps them to a 404."""
+    pool, conn = _stub_pool(mocker)
+    conn.copy_records_to_table.side_effect = (
+        asyncpg.exceptions.ForeignKeyViolationError()
+    )
+    items = [SensorDataCreate(unit_id=UNIT_A)] * COPY_MIN_BATCH_SIZE
+
+    with pytest.raises(asyncpg.exceptions.ForeignKeyViolationError):
+        await SensorDataRepository(pool).create_many(items)
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_locks_first(mocker):
+    """Partition creation runs after the advisory lock, in a transaction."""
+    pool, conn = _stub_pool(mocker)
+
+    await SensorDataRepository(pool).ensure_partitions(3)
+
+    conn.transaction.assert_called_once()
+    assert conn.execute.await_args_list == [
+        mocker.call(SQL_PARTITION_LOCK),
+        mocker.call(SQL_ENSURE_PARTITIONS, 3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_many_small_batch_uses_executemany(mocker):
+    """Batches below COPY_MIN_BATCH_SIZE go through executemany."""
+    pool, conn = _stub_pool(mocker)
+    items = [SensorDataCreate(unit_id=UNIT_A)] * (COPY_MIN_BATCH_SIZE - 1)
+
+    ids = await SensorDataRepository(pool).create_many(items)
+
+    assert len(ids) == len(items)
+    conn.prepared.return_value.executemany.assert_awaited_once()
+    conn.copy_records_to_table.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_many_large_batch_uses_copy(mocker):
+    """Batches of COPY_MIN_BATCH_SIZE or more go through COPY."""
+    pool, conn = _stub_pool(mocker)
+    items = [SensorDataCreate(unit_id=UNIT_A)] * COPY_MIN_BATCH_SIZE
+
+    ids = await SensorDataRepository(pool).create_many(items)
+
+    assert len(ids) == len(items)
+    conn.copy_records_to_table.assert_awaited_once()
+    conn.prepared.assert_not_awaited()
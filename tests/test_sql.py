@@ -0,0 +1,22 @@
+from app.crud.sql import build_update_query
+
+
+def test_build_update_query_bind_order():
+    """Columns bind as $1..$n in order; the id is the trailing $n+1."""
+    query = build_update_query("units", ("name", "location"))
+
+    assert query == (
+        "UPDATE units SET name = $1, location = $2 "
+        "WHERE id = $3 RETURNING *;"
+    )
+
+
+def test_build_update_query_cached_per_fields():
+    """The same column tuple always maps to the same query text."""
+    first = build_update_query("sensor_data", ("status", "temperature"))
+    second = build_update_query("sensor_data", ("status", "temperature"))
+
+    swapped = build_update_query("sensor_data", ("temperature", "status"))
+
+    assert first is second
+    assert swapped != first
@@ -56,6 +56,22 @@ async def test_create_unit_conflict(
     assert "already exists" in response.json()["detail"]
 
 
+@pytest.mark.asyncio
+async def test_create_unit_unknown_field(
+    client: AsyncClient,
+    mock_unit_repo: AsyncMock,
+    mock_db_connection
+):
+    """Test that unknown fields in the request body are rejected."""
+    response = await client.post(
+        "/v1/units/",
+        json={"name": "New Unit", "owner": "Nobody"}
+    )
+
+    assert response.status_code == 422
+    mock_unit_repo.create.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_unit_by_id_success(
     client: AsyncClient,
@@ -115,3 +131,20 @@ async def test_delete_unit_not_found(
     response = await client.delete(f"/v1/units/{uuid4()}")
 
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_unit_drops_cached_statistics(
+    client: AsyncClient,
+    mock_unit_repo: AsyncMock,
+    mock_db_connection,
+    fake_cache
+):
+    """Deleting a unit must not leave its statistics servable."""
+    fake_cache.store[f"sd:stats:{TEST_ID}"] = b'{"total_readings": 1}'
+    mock_unit_repo.delete.return_value = True
+
+    response = await client.delete(f"/v1/units/{TEST_ID}")
+
+    assert response.status_code == 204
+    assert f"sd:stats:{TEST_ID}" not in fake_cache.store